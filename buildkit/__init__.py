@@ -7,6 +7,7 @@ from .cython import (
     extensions_from_packages,
     extensions_from_sources,
     filter_changed_sources,
+    has_changed_sources,
     safe_cythonize,
 )
 from .flags import BuildFlags, consume_build_flags
@@ -33,6 +34,7 @@ __all__ = [
     "extensions_from_packages",
     "extensions_from_sources",
     "filter_changed_sources",
+    "has_changed_sources",
     "safe_cythonize",
     "is_dry_run_env",
     "is_old_env",
@@ -1,19 +1,43 @@
-from fnmatch import fnmatchcase
+import os
+from concurrent.futures import Executor, ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Optional, Set
+from typing import List, Optional, Pattern, Set
 
 from setuptools import Command
 from setuptools.command.build_ext import build_ext
 from setuptools.command.build_py import build_py
 from setuptools.command.develop import develop
 
+from .fsutil import link_or_copy
+from .globs import compile_globs
 from .options import BuildOptions, default_build_options
 from .release import strip_build_output, strip_sources
-from .runtime import is_dry_run_env
+from .runtime import build_jobs, is_dry_run_env
 from .summary import print_summary
 
 
-class ReleaseBuild(build_ext):
+class _ReleaseOptionsMixin:
+    """合并类级 keep_files/strip_patterns/skip_dirs 覆盖到 BuildOptions。"""
+
+    def _effective_options(self) -> BuildOptions:
+        base = self.options or default_build_options()
+        return base.merged_with_overrides(
+            keep_files=self.keep_files,
+            strip_patterns=self.strip_patterns,
+            skip_dirs=self.skip_dirs,
+        )
+
+
+def _covered_by_strip(path: Path, base_dir: Path, skip_dirs: Set[str]) -> bool:
+    # path 位于 base_dir 下且未被 skip_dirs 跳过时，base_dir 的清理已遍历过它
+    try:
+        rel_path = path.resolve().relative_to(base_dir.resolve())
+    except ValueError:
+        return False
+    return not any(part in skip_dirs for part in base_dir.parts + rel_path.parts)
+
+
+class ReleaseBuild(_ReleaseOptionsMixin, build_ext):
     """发布构建：编译扩展后清理源码文件。
 
     :param options: BuildOptions instance.
@@ -24,40 +48,37 @@ class ReleaseBuild(build_ext):
     strip_patterns: List[str] = []
     skip_dirs: Set[str] = set()
 
-    def _effective_options(self) -> BuildOptions:
-        base = self.options or default_build_options()
-        return base.merged_with_overrides(
-            keep_files=self.keep_files,
-            strip_patterns=self.strip_patterns,
-            skip_dirs=self.skip_dirs,
-        )
+    def finalize_options(self):
+        super().finalize_options()
+        # 未通过 -j / build -j 指定时，默认并行编译 C 扩展
+        if self.parallel is None:
+            self.parallel = (self.options.build_jobs if self.options else None) or build_jobs()
+
+    def copy_file(self, infile, outfile, preserve_mode=1, preserve_times=1, link=None, level=1):
+        # --inplace 时用硬链接代替整文件复制扩展产物
+        if link is None and not self.dry_run and os.path.isfile(infile) and not os.path.isdir(outfile):
+            return link_or_copy(infile, outfile), 1
+        return super().copy_file(infile, outfile, preserve_mode, preserve_times, link=link, level=level)
 
     def run(self):
         super().run()
         options = self._effective_options()
-        if not options.flags.is_release:
-            if options.summary_enabled:
-                print_summary(
-                    getattr(self, "package_list", []),
-                    getattr(self, "extensions", None),
-                    options=options,
-                )
-            return
-        removed = strip_sources(
-            options.base_dir,
-            options.strip_patterns,
-            options.keep_files,
-            options.skip_dirs,
-        )
-        build_lib = getattr(self, "build_lib", None)
-        if build_lib:
-            removed += strip_build_output(
-                Path(build_lib),
+        if options.flags.is_release:
+            removed = strip_sources(
+                options.base_dir,
                 options.strip_patterns,
                 options.keep_files,
                 options.skip_dirs,
             )
-        self.post_release_cleanup(removed, options)
+            build_lib = getattr(self, "build_lib", None)
+            if build_lib and not _covered_by_strip(Path(build_lib), options.base_dir, options.skip_dirs):
+                removed += strip_build_output(
+                    Path(build_lib),
+                    options.strip_patterns,
+                    options.keep_files,
+                    options.skip_dirs,
+                )
+            self.post_release_cleanup(removed, options)
         if options.summary_enabled:
             print_summary(
                 getattr(self, "package_list", []),
@@ -78,7 +99,18 @@ class ReleaseBuild(build_ext):
         print(f"[CLEAN] Removed {removed} source files in release mode")
 
 
-class ReleaseBuildPy(build_py):
+def _match_module_globs(file_path: str, regex: Pattern[str], base_prefix: str) -> bool:
+    # 文件名最常命中（如 pipeline.py），先判断；解析相对路径代价最高，放在最后
+    norm_path = os.path.normpath(file_path)
+    if regex.match(os.path.basename(norm_path)) or regex.match(norm_path.replace(os.sep, "/")):
+        return True
+    real_path = os.path.realpath(norm_path)
+    if not os.path.normcase(real_path).startswith(os.path.normcase(base_prefix)):
+        return False
+    return regex.match(real_path[len(base_prefix):].replace(os.sep, "/")) is not None
+
+
+class ReleaseBuildPy(_ReleaseOptionsMixin, build_py):
     """发布构建：build_py 后清理 build_lib 中的源码文件。
 
     :param options: BuildOptions instance.
@@ -96,37 +128,25 @@ class ReleaseBuildPy(build_py):
             globs += options.effective_exclude_modules()
         return globs
 
+    def finalize_options(self):
+        super().finalize_options()
+        self._module_exclude_re = compile_globs(self._module_exclude_globs(self.options)) if self.options else None
+
     def find_package_modules(self, package, package_dir):
         modules = super().find_package_modules(package, package_dir)
-        if not self.options:
-            return modules
-        globs = self._module_exclude_globs(self.options)
-        if not globs:
+        regex = self._module_exclude_re
+        if regex is None:
             return modules
+        base_prefix = os.path.join(os.path.realpath(self.options.base_dir), "")
         kept = []
         for pkg, mod, file_path in modules:
-            path = Path(file_path)
-            candidates = [path.as_posix(), path.name]
-            try:
-                base_dir = self.options.base_dir.resolve()
-                candidates.append(path.resolve().relative_to(base_dir).as_posix())
-            except Exception:
-                pass
-            if any(fnmatchcase(candidate, pattern) for candidate in candidates for pattern in globs):
+            if _match_module_globs(file_path, regex, base_prefix):
                 if is_dry_run_env():
-                    print(f"[DRY-RUN] Would exclude module {path}")
+                    print(f"[DRY-RUN] Would exclude module {file_path}")
                 continue
             kept.append((pkg, mod, file_path))
         return kept
 
-    def _effective_options(self) -> BuildOptions:
-        base = self.options or default_build_options()
-        return base.merged_with_overrides(
-            keep_files=self.keep_files,
-            strip_patterns=self.strip_patterns,
-            skip_dirs=self.skip_dirs,
-        )
-
     def run(self):
         super().run()
         options = self._effective_options()
@@ -147,6 +167,31 @@ class ReleaseBuildPy(build_py):
         print(f"[CLEAN] Removed {removed} source files in build_py output")
 
 
+def _unlink_quietly(path: str) -> None:
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
+
+
+def _remove_tree(target: Path, skip_dirs: Set[str], executor: Executor) -> None:
+    if not target.exists():
+        return
+    dirs: List[str] = []
+    files: List[str] = []
+    for root, dir_names, file_names in os.walk(target):
+        dir_names[:] = [name for name in dir_names if name not in skip_dirs]
+        dirs.append(root)
+        files.extend(os.path.join(root, name) for name in file_names)
+    # unlink 以系统调用等待为主，交给线程池并发执行
+    list(executor.map(_unlink_quietly, files))
+    for dir_path in reversed(dirs):
+        try:
+            os.rmdir(dir_path)
+        except OSError:
+            pass
+
+
 class CleanBuild(Command):
     """清理构建产物（build、临时目录、扩展文件）。"""
 
@@ -171,38 +216,11 @@ class CleanBuild(Command):
     def run(self):
         options = self._effective_options()
         base_dir = options.base_dir
-        for dir_name in self.clean_dirs:
-            target = base_dir / dir_name
-            if target.exists():
-                for path in sorted(target.rglob("*"), reverse=True):
-                    if any(part in options.skip_dirs for part in path.parts):
-                        continue
-                    try:
-                        if path.is_dir():
-                            path.rmdir()
-                        else:
-                            path.unlink()
-                    except OSError:
-                        pass
-                try:
-                    target.rmdir()
-                except OSError:
-                    pass
-        if options.use_temp_build:
-            temp_dir = base_dir / options.temp_build_dir
-            if temp_dir.exists():
-                for path in sorted(temp_dir.rglob("*"), reverse=True):
-                    try:
-                        if path.is_dir():
-                            path.rmdir()
-                        else:
-                            path.unlink()
-                    except OSError:
-                        pass
-                try:
-                    temp_dir.rmdir()
-                except OSError:
-                    pass
+        with ThreadPoolExecutor() as executor:
+            for dir_name in self.clean_dirs:
+                _remove_tree(base_dir / dir_name, options.skip_dirs, executor)
+            if options.use_temp_build:
+                _remove_tree(base_dir / options.temp_build_dir, set(), executor)
         strip_sources(base_dir, self.clean_patterns, options.keep_files, options.skip_dirs)
 
 
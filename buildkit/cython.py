@@ -1,13 +1,24 @@
-import json
-from fnmatch import fnmatchcase
+import copy
+import hashlib
+import os
+import pickle
+import re
+import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional, Set
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Pattern, Set, Tuple
 
+from Cython import __version__ as CYTHON_VERSION
 from Cython.Compiler.Errors import CompileError
 from setuptools import Extension
 
-from .runtime import is_dry_run_env
+from .globs import compile_globs, matched_glob
+from .runtime import cythonize_jobs, is_dry_run_env
 
+_HASH_CHUNK = 64 * 1024
+_hash_buffers = threading.local()
+_C_STAMP_RE = re.compile(rb"/\* buildkit-src-hash: ([0-9a-f]+) \*/\s*$")
 
 CYTHON_DIRECTIVES_SIMPLE: Dict[str, object] = {
     "language_level": "3",
@@ -38,23 +49,50 @@ def _ensure_cythonize():
     return cythonize
 
 
-def _exclude_reason(path: Path, exclude_globs: List[str], exclude_dirs: Set[str]) -> Optional[str]:
-    posix_path = path.as_posix()
-    for item in exclude_dirs:
-        if "/" in item or "\\" in item:
-            if item.replace("\\", "/") in posix_path:
-                return f"dir:{item}"
-    for part in path.parts:
+def _to_posix(path: str) -> str:
+    return path if os.sep == "/" else path.replace(os.sep, "/")
+
+
+def _exclude_dir_paths(exclude_dirs: Set[str]) -> List[Tuple[str, str]]:
+    return [(item, item.replace("\\", "/")) for item in exclude_dirs if "/" in item or "\\" in item]
+
+
+def _exclude_reason(
+    posix_path: str,
+    exclude_globs: List[str],
+    exclude_dirs: Set[str],
+    dir_paths: List[Tuple[str, str]],
+    glob_re: Optional[Pattern[str]],
+) -> Optional[str]:
+    for item, posix_item in dir_paths:
+        if posix_item in posix_path:
+            return f"dir:{item}"
+    for part in posix_path.split("/"):
         if part in exclude_dirs:
             return f"dir:{part}"
-    if not exclude_globs:
-        return None
-    for pattern in exclude_globs:
-        if fnmatchcase(posix_path, pattern):
-            return f"glob:{pattern}"
+    pattern = matched_glob(glob_re, exclude_globs, posix_path)
+    if pattern:
+        return f"glob:{pattern}"
     return None
 
 
+def _walk_py(root: str, prune: Callable[[str], bool]) -> Iterator[os.DirEntry]:
+    stack = [root]
+    while stack:
+        current = stack.pop()
+        try:
+            entries = os.scandir(current)
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if not prune(entry.path):
+                        stack.append(entry.path)
+                elif entry.name.endswith(".py") and entry.is_file():
+                    yield entry
+
+
 def discover_sources_from_packages(
     packages: List[str],
     package_dir: Dict[str, str],
@@ -70,27 +108,42 @@ def discover_sources_from_packages(
     :return: list of source paths.
     """
     sources: List[Path] = []
+    seen: Set[str] = set()
     dry_run = is_dry_run_env()
     exclude_globs = exclude_globs or []
     exclude_dirs = exclude_dirs or set()
+    glob_re = compile_globs(exclude_globs)
+    dir_paths = _exclude_dir_paths(exclude_dirs)
+
+    def _prune(dir_path: str) -> bool:
+        # 目录命中 exclude_dirs 时其下所有文件都会被排除，直接跳过整棵子树
+        reason = _exclude_reason(_to_posix(dir_path), [], exclude_dirs, dir_paths, None)
+        if reason and dry_run:
+            print(f"[DRY-RUN] Would exclude source dir {dir_path} ({reason})")
+        return reason is not None
+
     for pkg in packages:
         parts = pkg.split(".")
         top_pkg = parts[0]
         base = package_dir.get(top_pkg, top_pkg)
-        pkg_dir = Path(base, *parts[1:])
-        if not pkg_dir.exists():
-            continue
-        for py_file in pkg_dir.rglob("*.py"):
-            reason = _exclude_reason(py_file, exclude_globs, exclude_dirs)
+        # 包目录不存在时 _walk_py 的 scandir 会直接跳过，无需额外 stat；
+        # 规范化根路径（去掉 "./" 等），排除规则按 entry.path 匹配
+        for entry in _walk_py(os.path.normpath(os.path.join(base, *parts[1:])), _prune):
+            # 父包与子包同时列出时子包文件会被重复遍历
+            key = os.path.normpath(entry.path)
+            if key in seen:
+                continue
+            seen.add(key)
+            reason = _exclude_reason(_to_posix(entry.path), exclude_globs, exclude_dirs, dir_paths, glob_re)
             if reason:
                 if dry_run:
-                    print(f"[DRY-RUN] Would exclude source {py_file} ({reason})")
+                    print(f"[DRY-RUN] Would exclude source {entry.path} ({reason})")
                 continue
-            if exclude_init and py_file.name == "__init__.py":
+            if exclude_init and entry.name == "__init__.py":
                 if dry_run:
-                    print(f"[DRY-RUN] Would exclude init {py_file}")
+                    print(f"[DRY-RUN] Would exclude init {entry.path}")
                 continue
-            sources.append(py_file)
+            sources.append(Path(entry.path))
     return sources
 
 
@@ -102,14 +155,15 @@ def extensions_from_sources(sources: Iterable[Path], base_dir: Optional[Path] =
     :return: list of Extension.
     """
     root = base_dir or Path.cwd()
+    prefix = os.path.join(os.path.realpath(root), "")
+    prefix_key = os.path.normcase(prefix)
     extensions: List[Extension] = []
     for src in sources:
-        try:
-            rel = src.resolve().relative_to(root.resolve()).with_suffix("")
-        except ValueError as exc:
-            raise ValueError(f"Source {src} is not under base_dir {root}. Set base_dir explicitly.") from exc
-        mod_name = ".".join(rel.parts)
-        extensions.append(Extension(mod_name, [str(src)]))
+        real = os.path.realpath(src)
+        if not os.path.normcase(real).startswith(prefix_key):
+            raise ValueError(f"Source {src} is not under base_dir {root}. Set base_dir explicitly.")
+        mod_name = os.path.splitext(real[len(prefix):])[0].replace(os.sep, ".")
+        extensions.append(Extension(mod_name, [os.fspath(src)]))
     return extensions
 
 
@@ -130,23 +184,175 @@ def extensions_from_packages(
     return extensions_from_sources(sources, base_dir=base_dir or Path.cwd())
 
 
-def safe_cythonize(extensions: List[Extension], compiler_directives: Dict[str, object]) -> List[Extension]:
+def _cythonize_batch(cythonize, extensions: List[Extension], cythonize_options: Dict[str, object]) -> List[Extension]:
+    if not extensions:
+        return []
+    try:
+        return list(cythonize(extensions, **cythonize_options))
+    except CompileError as exc:
+        if len(extensions) == 1:
+            print(f"[ERROR] Error compiling {extensions[0].name}: {exc}. Skipping.")
+            return []
+    except Exception as exc:
+        if len(extensions) == 1:
+            print(f"[ERROR] Unexpected error in {extensions[0].name}: {exc}. Skipping.")
+            return []
+    # 批次失败时二分重试；未开启 force 时，已生成的 .c 会被 cythonize 视为最新而跳过
+    mid = len(extensions) // 2
+    return _cythonize_batch(cythonize, extensions[:mid], cythonize_options) + _cythonize_batch(
+        cythonize, extensions[mid:], cythonize_options
+    )
+
+
+def _hash_file(digest, path) -> None:
+    # 分块流式读取，每个线程复用同一缓冲区，避免大文件整体读入内存
+    view = getattr(_hash_buffers, "view", None)
+    if view is None:
+        view = _hash_buffers.view = memoryview(bytearray(_HASH_CHUNK))
+    with open(path, "rb", buffering=0) as fh:
+        while True:
+            size = fh.readinto(view)
+            if not size:
+                break
+            digest.update(view[:size])
+
+
+def _c_source_stamp(deps, src: str, module_name: str, directives_key: bytes) -> str:
+    # 模块名、源码及其 cimport/include 依赖、同名 .pxd、编译指令与 Cython 版本任一变化都会使生成的 .c 失效
+    paths = set(deps.all_dependencies(src))
+    pxd_path = os.path.splitext(src)[0] + ".pxd"
+    if os.path.exists(pxd_path):
+        paths.add(pxd_path)
+    digest = hashlib.blake2b(directives_key, digest_size=16)
+    digest.update(module_name.encode("utf-8"))
+    for path in sorted(paths):
+        digest.update(os.fsencode(path))
+        _hash_file(digest, path)
+    return digest.hexdigest()
+
+
+def _reused_extension(deps, ext: Extension, src: str) -> Extension:
+    # 按 cythonize 的方式合并 "# distutils:" 头部配置，复用 .c 时不丢失链接参数等设置
+    from Cython.Build.Dependencies import DistutilsInfo
+
+    base = DistutilsInfo(exn=ext)
+    kwds = deps.distutils_info(src, None, base).values
+    for key, value in base.values.items():
+        kwds.setdefault(key, value)
+    reused = copy.copy(ext)
+    for key, value in kwds.items():
+        if key not in ("name", "sources", "np_pythran"):
+            setattr(reused, key, value)
+    target = os.path.splitext(src)[0] + (".cpp" if kwds.get("language") == "c++" else ".c")
+    sources = [target] + list(ext.sources[1:])
+    for extra in kwds.get("sources", []):
+        if extra not in sources:
+            sources.append(extra)
+    reused.sources = sources
+    return reused
+
+
+def _read_c_stamp(c_path: str) -> Optional[str]:
+    try:
+        with open(c_path, "rb") as fh:
+            fh.seek(0, os.SEEK_END)
+            fh.seek(max(0, fh.tell() - 128))
+            tail = fh.read()
+    except OSError:
+        return None
+    match = _C_STAMP_RE.search(tail)
+    return match.group(1).decode("ascii") if match else None
+
+
+def _write_c_stamp(c_path: str, stamp: str) -> None:
+    # 写入新文件后替换，不原地追加，避免修改与其他路径共享 inode 的 .c
+    tmp_path = f"{c_path}.buildkit-stamp"
+    with open(c_path, "rb") as src, open(tmp_path, "wb") as dst:
+        shutil.copyfileobj(src, dst)
+        dst.write(f"\n/* buildkit-src-hash: {stamp} */\n".encode("ascii"))
+    os.replace(tmp_path, c_path)
+
+
+def safe_cythonize(
+    extensions: List[Extension],
+    compiler_directives: Dict[str, object],
+    nthreads: Optional[int] = None,
+    cache: Optional[str] = None,
+    force: bool = False,
+    quiet: bool = False,
+    reuse_c: bool = False,
+) -> List[Extension]:
     """安全执行 cythonize，失败模块将跳过。
 
+    整批并行编译；批次失败时二分拆分重试，只跳过出错的模块。
+    开启 reuse_c 时在生成的 .c 末尾写入源码指纹，指纹一致的模块直接复用已有 .c。
+
     :param extensions: extension list.
     :param compiler_directives: cython directives.
+    :param nthreads: parallel cythonize processes; None uses CYTHONIZE_JOBS, 0 or 1 runs serially (default).
+    :param cache: Cython codegen cache dir for reusing generated .c across builds; None disables it.
+    :param force: regenerate .c even when it is newer than the source.
+    :param quiet: silence Cython status output; this also hides compile error details.
+    :param reuse_c: skip cythonize for modules whose existing .c carries a matching source hash.
     :return: compiled extensions.
     """
+    if not extensions:
+        return []
+    reuse = reuse_c and not force
+    reused: Dict[str, Extension] = {}
+    stamps: Dict[str, str] = {}
+    pending = list(extensions)
+    if reuse:
+        from Cython.Build.Dependencies import create_dependency_tree
+
+        deps = create_dependency_tree()
+        directives_key = repr((CYTHON_VERSION, sorted(compiler_directives.items()))).encode()
+        pending = []
+        for ext in extensions:
+            src = ext.sources[0]
+            if not src.endswith((".py", ".pyx")):
+                # 手写 .c 等非 Cython 源码原样透传，不参与复用与指纹写入
+                reused[ext.name] = ext
+                continue
+            try:
+                stamp = _c_source_stamp(deps, src, ext.name, directives_key)
+                candidate = _reused_extension(deps, ext, src)
+            except Exception:
+                # 依赖分析失败时交给 cythonize 正常处理并报告
+                pending.append(ext)
+                continue
+            stamps[ext.name] = stamp
+            target = candidate.sources[0]
+            if _read_c_stamp(target) == stamp:
+                reused[ext.name] = candidate
+                continue
+            pending.append(ext)
+            # 删除过期 .c 让 cythonize 重新生成；不使用 force，二分重试时已生成的模块仍会被跳过
+            try:
+                os.unlink(target)
+            except FileNotFoundError:
+                pass
+        if not pending:
+            return [reused[ext.name] for ext in extensions]
     cythonize = _ensure_cythonize()
-    compiled: List[Extension] = []
-    for ext in extensions:
-        try:
-            compiled.extend(cythonize([ext], compiler_directives=compiler_directives))
-        except CompileError as exc:
-            print(f"[ERROR] Error compiling {ext.name}: {exc}. Skipping.")
-        except Exception as exc:
-            print(f"[ERROR] Unexpected error in {ext.name}: {exc}. Skipping.")
-    return compiled
+    jobs = cythonize_jobs() if nthreads is None else nthreads
+    cythonize_options: Dict[str, object] = {
+        "compiler_directives": compiler_directives,
+        # Cython 仅在 nthreads 为假值时串行，nthreads=1 仍会创建进程池
+        "nthreads": jobs if jobs > 1 else 0,
+        "force": force,
+        "quiet": quiet,
+    }
+    if cache:
+        cythonize_options["cache"] = cache
+    compiled = _cythonize_batch(cythonize, pending, cythonize_options)
+    if not reuse:
+        return compiled
+    for ext in compiled:
+        if ext.name in stamps:
+            _write_c_stamp(ext.sources[0], stamps[ext.name])
+    reused.update((ext.name, ext) for ext in compiled)
+    return [reused[ext.name] for ext in extensions if ext.name in reused]
 
 
 def cythonize_extensions(
@@ -165,43 +371,110 @@ def cythonize_extensions(
     return cythonize(extensions, compiler_directives=compiler_directives, annotate=annotate)
 
 
-def _load_cache(cache_file: Path) -> Dict[str, float]:
-    if cache_file.exists():
-        return json.loads(cache_file.read_text())
-    return {}
+def _fingerprint(path: Path) -> bytes:
+    digest = hashlib.blake2b(digest_size=16)
+    _hash_file(digest, path)
+    return digest.digest()
 
 
-def _save_cache(cache_file: Path, cache: Dict[str, float]) -> None:
-    cache_file.write_text(json.dumps(cache, indent=2))
+def _load_cache(cache_file: Path) -> Dict[str, Tuple[int, int, bytes]]:
+    try:
+        cache = pickle.loads(cache_file.read_bytes())
+    except FileNotFoundError:
+        return {}
+    except Exception:
+        # 旧版 JSON 缓存或损坏文件，按空缓存处理
+        return {}
+    return cache if isinstance(cache, dict) else {}
+
+
+def _save_cache(cache_file: Path, cache: Dict[str, Tuple[int, int, bytes]]) -> None:
+    # 先写临时文件再原子替换，构建中断时不会留下截断的缓存
+    tmp_file = cache_file.with_name(f"{cache_file.name}.tmp")
+    tmp_file.write_bytes(pickle.dumps(cache, protocol=pickle.HIGHEST_PROTOCOL))
+    os.replace(tmp_file, cache_file)
+
+
+def _probe_source(
+    src: Path,
+    previous: Optional[Tuple[int, int, bytes]],
+    fingerprint: Callable[[Path], bytes],
+) -> Optional[Tuple[Tuple[int, int, bytes], bool]]:
+    try:
+        st = os.stat(src)
+    except FileNotFoundError:
+        return None
+    if previous and previous[:2] == (st.st_mtime_ns, st.st_size):
+        return previous, False
+    digest = fingerprint(src)
+    return (st.st_mtime_ns, st.st_size, digest), not previous or previous[2] != digest
+
+
+def has_changed_sources(
+    sources: Iterable[Path],
+    cache_file: Path,
+    fingerprint_fn: Optional[Callable[[Path], bytes]] = None,
+) -> bool:
+    """判断是否存在变更源文件，不写入缓存，命中首个变更即返回。
+
+    :param sources: source paths.
+    :param cache_file: cache file path.
+    :param fingerprint_fn: custom fingerprint function; defaults to blake2b of file content.
+    :return: True when any source changed since the last filter_changed_sources.
+    """
+    fingerprint = fingerprint_fn or _fingerprint
+    old_cache = _load_cache(cache_file)
+    for src in sources:
+        probed = _probe_source(src, old_cache.get(str(src)), fingerprint)
+        if probed and probed[1]:
+            return True
+    return False
 
 
 def filter_changed_sources(
     sources: Iterable[Path],
     cache_file: Path,
     force: bool = False,
+    fingerprint_fn: Optional[Callable[[Path], bytes]] = None,
 ) -> List[Path]:
-    """根据 mtime 缓存过滤变更源文件。
+    """根据内容指纹缓存过滤变更源文件。
+
+    mtime 与大小均未变化时直接复用缓存指纹，不再读取文件内容。
+    默认指纹在线程池中并发探测；自定义 fingerprint_fn 不要求线程安全，按顺序串行调用。
 
     :param sources: source paths.
     :param cache_file: cache file path.
     :param force: rebuild all sources.
+    :param fingerprint_fn: custom fingerprint function; defaults to blake2b of file content.
     :return: changed source paths.
     """
     if force:
         return [src for src in sources if src.exists()]
 
+    fingerprint = fingerprint_fn or _fingerprint
     old_cache = _load_cache(cache_file)
-    new_cache: Dict[str, float] = {}
+    new_cache: Dict[str, Tuple[int, int, bytes]] = {}
     changed: List[Path] = []
 
-    for src in sources:
-        if not src.exists():
+    items = list(sources)
+
+    def _probe(src: Path) -> Optional[Tuple[Tuple[int, int, bytes], bool]]:
+        return _probe_source(src, old_cache.get(str(src)), fingerprint)
+
+    if fingerprint_fn is None:
+        # stat/读文件会释放 GIL，线程池可重叠网络盘或大目录树上的 I/O 延迟
+        with ThreadPoolExecutor() as executor:
+            results = list(executor.map(_probe, items))
+    else:
+        # 自定义指纹（如 Cython AST 校验和）可能不是线程安全的，串行执行
+        results = [_probe(src) for src in items]
+    for src, probed in zip(items, results):
+        if probed is None:
             continue
-        mtime = src.stat().st_mtime
-        key = str(src)
-        new_cache[key] = mtime
-        if old_cache.get(key) != mtime:
+        new_cache[str(src)], is_changed = probed
+        if is_changed:
             changed.append(src)
 
-    _save_cache(cache_file, new_cache)
+    if new_cache != old_cache:
+        _save_cache(cache_file, new_cache)
     return changed
@@ -0,0 +1,26 @@
+import os
+import shutil
+
+
+def link_or_copy(src: str, dst: str) -> str:
+    """以硬链接方式发布文件，跨设备或不支持时回退为复制。
+
+    先链接到临时名再 os.replace，目标已存在时也能原子替换，且不会截断正在使用的旧文件。
+
+    :param src: source file.
+    :param dst: destination file.
+    :return: destination path.
+    """
+    if os.path.exists(dst) and os.path.samefile(src, dst):
+        return dst
+    tmp = f"{dst}.buildkit-link"
+    try:
+        os.link(src, tmp)
+        os.replace(tmp, dst)
+    except OSError:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        shutil.copy2(src, dst)
+    return dst
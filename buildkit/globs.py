@@ -0,0 +1,39 @@
+import re
+from fnmatch import translate
+from functools import lru_cache
+from typing import Iterable, List, Optional, Pattern, Tuple
+
+
+@lru_cache(maxsize=64)
+def _compile_union(patterns: Tuple[str, ...]) -> Pattern[str]:
+    return re.compile("|".join(f"(?P<p{index}>{translate(pattern)})" for index, pattern in enumerate(patterns)))
+
+
+def compile_globs(patterns: Iterable[str]) -> Optional[Pattern[str]]:
+    """将多个 glob 模式编译为单个正则，语义与 fnmatchcase 一致。
+
+    相同模式组合的编译结果会被缓存复用。
+
+    :param patterns: glob patterns.
+    :return: compiled regex; None when no patterns.
+    """
+    items = tuple(patterns)
+    if not items:
+        return None
+    return _compile_union(items)
+
+
+def matched_glob(regex: Optional[Pattern[str]], patterns: List[str], value: str) -> Optional[str]:
+    """返回命中的 glob 模式。
+
+    :param regex: regex from compile_globs(patterns).
+    :param patterns: glob patterns used to build regex.
+    :param value: string to match.
+    :return: matched pattern; None when nothing matches.
+    """
+    if regex is None:
+        return None
+    match = regex.match(value)
+    if not match:
+        return None
+    return patterns[int(match.lastgroup[1:])]
@@ -19,8 +19,13 @@ class BuildOptions:
     :param skip_dirs: directory names to skip during cleanup.
     :param temp_build_dir: temporary build directory name.
     :param use_temp_build: whether to use temporary build directory.
+    :param temp_copy_mode: how sources are staged into the temp dir: "copy" or "link" (hardlink, falls back to copy).
     :param cython_directives: compiler directives for cythonize.
     :param cython_incremental: enable incremental cythonize.
+    :param cython_nthreads: parallel cythonize processes; None uses CYTHONIZE_JOBS, 0 or 1 runs serially (default).
+    :param cython_cache: Cython codegen cache dir; defaults to CYTHON_CACHE_DIR, None disables it.
+    :param build_jobs: parallel C compile jobs for ReleaseBuild; None uses MAX_JOBS or cpu count.
+    :param cython_reuse_c: reuse generated .c files whose embedded source hash still matches.
     :param cy_cache_file: cache file path for incremental builds.
     :param summary_enabled: enable summary output.
     :param exclude_packages: package name patterns to exclude.
@@ -52,8 +57,13 @@ class BuildOptions:
     )
     temp_build_dir: str = field(default_factory=lambda: os.environ.get("BUILD_TEMP_DIR", ".build_package_tmp"))
     use_temp_build: bool = field(default_factory=lambda: os.environ.get("USE_TEMP_BUILD", "0") == "1")
+    temp_copy_mode: str = field(default_factory=lambda: os.environ.get("BUILD_TEMP_COPY_MODE", "copy"))
     cython_directives: Dict[str, object] = field(default_factory=lambda: dict(CYTHON_DIRECTIVES_SIMPLE))
     cython_incremental: bool = False
+    cython_nthreads: Optional[int] = None
+    cython_cache: Optional[str] = field(default_factory=lambda: os.environ.get("CYTHON_CACHE_DIR") or None)
+    cython_reuse_c: bool = False
+    build_jobs: Optional[int] = None
     cy_cache_file: Path = field(default_factory=lambda: Path(".cycache"))
     summary_enabled: bool = True
     exclude_packages: List[str] = field(default_factory=list)
@@ -89,8 +99,13 @@ class BuildOptions:
             skip_dirs=set(self.skip_dirs) | set(skip_dirs or set()),
             temp_build_dir=self.temp_build_dir,
             use_temp_build=self.use_temp_build,
+            temp_copy_mode=self.temp_copy_mode,
             cython_directives=dict(self.cython_directives),
             cython_incremental=self.cython_incremental,
+            cython_nthreads=self.cython_nthreads,
+            cython_cache=self.cython_cache,
+            cython_reuse_c=self.cython_reuse_c,
+            build_jobs=self.build_jobs,
             cy_cache_file=self.cy_cache_file,
             summary_enabled=self.summary_enabled,
             exclude_package_patterns=list(self.exclude_package_patterns),
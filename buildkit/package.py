@@ -1,18 +1,33 @@
 from fnmatch import fnmatchcase
 from pathlib import Path
-from typing import Iterable, List, Set, Tuple
+from typing import Callable, Dict, Iterable, List, Set, Tuple
 
 from setuptools import find_namespace_packages, find_packages
 
+from .globs import compile_globs
+
 
 def _is_pattern(value: str) -> bool:
     return any(ch in value for ch in ("*", "?", "[", "]"))
 
 
-def _match_exclude_pattern(pkg: str, pattern: str) -> bool:
-    if _is_pattern(pattern):
-        return fnmatchcase(pkg, pattern)
-    return pkg == pattern or pkg.startswith(f"{pattern}.")
+def _exclude_matcher(exclude_patterns: List[str]) -> Callable[[str], bool]:
+    # 通配模式合并为单个正则；普通包名按自身及子包前缀做集合查找
+    names = {pat for pat in exclude_patterns if not _is_pattern(pat)}
+    glob_re = compile_globs(pat for pat in exclude_patterns if _is_pattern(pat))
+
+    def _match(pkg: str) -> bool:
+        if names:
+            if pkg in names:
+                return True
+            index = pkg.find(".")
+            while index != -1:
+                if pkg[:index] in names:
+                    return True
+                index = pkg.find(".", index + 1)
+        return glob_re is not None and glob_re.match(pkg) is not None
+
+    return _match
 
 
 def _normalize_root_dir(base_dir: Path, package_dir: dict, top_pkg: str) -> Path:
@@ -28,16 +43,21 @@ def _expand_wildcard(
     base_dir: Path,
     package_dir: dict,
     use_namespace_packages: bool,
+    found_cache: Dict[Path, List[str]],
 ) -> List[str]:
     top_pkg = pattern.split(".")[0] if "." in pattern else ""
     finder = find_namespace_packages if use_namespace_packages else find_packages
     if top_pkg:
         root_dir = _normalize_root_dir(base_dir, package_dir, top_pkg)
-        candidates = finder(where=str(root_dir))
+    else:
+        root_dir = (base_dir / package_dir.get("", ".")).resolve()
+    # 同一根目录下的多个通配模式共享一次包扫描
+    if root_dir not in found_cache:
+        found_cache[root_dir] = finder(where=str(root_dir))
+    candidates = found_cache[root_dir]
+    if top_pkg:
         full_names = [top_pkg] + [f"{top_pkg}.{name}" for name in candidates]
         return [name for name in full_names if fnmatchcase(name, pattern)]
-    root_dir = (base_dir / package_dir.get("", ".")).resolve()
-    candidates = finder(where=str(root_dir))
     return [name for name in candidates if fnmatchcase(name, pattern)]
 
 
@@ -57,9 +77,10 @@ def expand_packages(
     """
     expanded: List[str] = []
     seen: Set[str] = set()
+    found_cache: Dict[Path, List[str]] = {}
     for pkg in packages:
         if _is_pattern(pkg):
-            found = _expand_wildcard(pkg, base_dir, package_dir, use_namespace_packages)
+            found = _expand_wildcard(pkg, base_dir, package_dir, use_namespace_packages, found_cache)
             for name in found:
                 if name in seen:
                     continue
@@ -80,9 +101,10 @@ def filter_packages(packages: Iterable[str], exclude_patterns: List[str]) -> Lis
     :param exclude_patterns: patterns or substrings to exclude.
     :return: filtered package list.
     """
+    is_excluded = _exclude_matcher(exclude_patterns)
     filtered: List[str] = []
     for pkg in packages:
-        if any(_match_exclude_pattern(pkg, pat) for pat in exclude_patterns):
+        if is_excluded(pkg):
             continue
         filtered.append(pkg)
     return filtered
@@ -100,8 +122,9 @@ def split_packages(
     """
     included: List[str] = []
     excluded: List[str] = []
+    is_excluded = _exclude_matcher(exclude_patterns)
     for pkg in packages:
-        if any(_match_exclude_pattern(pkg, pat) for pat in exclude_patterns):
+        if is_excluded(pkg):
             excluded.append(pkg)
             continue
         included.append(pkg)
@@ -16,6 +16,13 @@ from .package import exclude_patterns_to_paths, expand_packages, package_to_path
 from .summary import copy_to_temp_build_dir, get_package_dir_mapping
 
 
+def _relative_posix(path: Path, root: Path) -> str:
+    try:
+        return path.relative_to(root).as_posix()
+    except ValueError:
+        return path.as_posix()
+
+
 @dataclass
 class BuildPlan:
     """统一构建流程的上下文。
@@ -80,20 +87,11 @@ class BuildPlan:
         if self.options.flags.is_old:
             return []
         exclude_patterns = self.options.effective_exclude_packages() + self.exclude_packages
-        excluded_dirs = set()
-        for pkg in self.excluded_packages:
-            path = package_to_path(pkg, self.effective_package_dir, self.build_root)
-            try:
-                rel = path.relative_to(self.build_root).as_posix()
-            except ValueError:
-                rel = path.as_posix()
-            excluded_dirs.add(rel)
-        for path in exclude_patterns_to_paths(exclude_patterns, self.effective_package_dir, self.build_root):
-            try:
-                rel = path.relative_to(self.build_root).as_posix()
-            except ValueError:
-                rel = path.as_posix()
-            excluded_dirs.add(rel)
+        excluded_paths = [
+            package_to_path(pkg, self.effective_package_dir, self.build_root) for pkg in self.excluded_packages
+        ]
+        excluded_paths += exclude_patterns_to_paths(exclude_patterns, self.effective_package_dir, self.build_root)
+        excluded_dirs = {_relative_posix(path, self.build_root) for path in excluded_paths}
         sources = discover_sources_from_packages(
             self.effective_packages,
             self.effective_package_dir,
@@ -104,8 +102,16 @@ class BuildPlan:
         )
         if self.options.cython_incremental:
             sources = filter_changed_sources(sources, self.options.cy_cache_file)
+        if not sources:
+            return []
         extensions = extensions_from_sources(sources, base_dir=self.build_root)
-        return safe_cythonize(extensions, self.options.cython_directives)
+        return safe_cythonize(
+            extensions,
+            self.options.cython_directives,
+            nthreads=self.options.cython_nthreads,
+            cache=self.options.cython_cache,
+            reuse_c=self.options.cython_reuse_c,
+        )
 
     def cmdclass(
         self,
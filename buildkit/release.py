@@ -1,6 +1,8 @@
+import os
 from pathlib import Path
 from typing import List, Set
 
+from .globs import compile_globs
 from .runtime import is_dry_run_env
 
 
@@ -8,15 +10,39 @@ def _should_skip(path: Path, skip_dirs: Set[str]) -> bool:
     return any(part in skip_dirs for part in path.parts)
 
 
+def _is_suffix_pattern(pattern: str) -> bool:
+    return pattern.startswith("*.") and not any(ch in pattern[2:] for ch in "*?[].")
+
+
 def _collect_targets(
     base_dir: Path,
     patterns: List[str],
     keep_files: Set[str],
     skip_dirs: Set[str],
 ) -> List[Path]:
+    if _should_skip(base_dir, skip_dirs):
+        return []
+    # 文件名模式一次遍历匹配：纯后缀（如 *.py）走集合查找，其余合并为单个正则
+    name_patterns = [os.path.normcase(pattern) for pattern in patterns if "/" not in pattern]
+    suffixes = {pattern[1:] for pattern in name_patterns if _is_suffix_pattern(pattern)}
+    name_re = compile_globs(pattern for pattern in name_patterns if not _is_suffix_pattern(pattern))
     targets: List[Path] = []
-    seen: Set[Path] = set()
+    if suffixes or name_re is not None:
+        for root, dir_names, file_names in os.walk(base_dir):
+            dir_names[:] = [name for name in dir_names if name not in skip_dirs]
+            for name in file_names:
+                if name in keep_files or name in skip_dirs:
+                    continue
+                key = os.path.normcase(name)
+                dot = key.rfind(".")
+                if (dot != -1 and key[dot:] in suffixes) or (name_re is not None and name_re.match(key)):
+                    targets.append(Path(root, name))
+
+    # 含路径分隔符的模式保留 rglob 语义
+    seen: Set[Path] = set(targets)
     for pattern in patterns:
+        if "/" not in pattern:
+            continue
         for path in base_dir.rglob(pattern):
             if _should_skip(path, skip_dirs):
                 continue
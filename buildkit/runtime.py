@@ -1,14 +1,27 @@
 import os
+from typing import Optional
 
 
 DRY_RUN_ENV = "BUILDKIT_DRY_RUN"
 RELEASE_ENV = "BUILDKIT_RELEASE"
 OLD_ENV = "BUILDKIT_OLD"
+CYTHONIZE_JOBS_ENV = "CYTHONIZE_JOBS"
+BUILD_JOBS_ENV = "MAX_JOBS"
+
+_TRUTHY = frozenset(("1", "true", "yes", "on"))
 
 
 def _env_truthy(name: str) -> bool:
-    value = os.environ.get(name, "0").strip().lower()
-    return value in {"1", "true", "yes", "on"}
+    value = os.environ.get(name)
+    # 未设置是最常见的情况，无需再做字符串处理
+    if not value:
+        return False
+    return value.strip().lower() in _TRUTHY
+
+
+def _env_int(name: str) -> Optional[int]:
+    value = os.environ.get(name, "").strip()
+    return int(value) if value.isdigit() else None
 
 
 def _set_env_flag(name: str, enabled: bool) -> None:
@@ -64,3 +77,21 @@ def is_old_env() -> bool:
     :return: True when old env enabled.
     """
     return _env_truthy(OLD_ENV)
+
+
+def cythonize_jobs() -> int:
+    """获取 cythonize 并行进程数。
+
+    未设置时默认串行：spawn 平台（macOS/Windows）上 Cython 进程池会重新执行无 __main__ 保护的 setup.py。
+
+    :return: CYTHONIZE_JOBS when set, otherwise 0 (serial).
+    """
+    return _env_int(CYTHONIZE_JOBS_ENV) or 0
+
+
+def build_jobs() -> int:
+    """获取 build_ext 并行编译数。
+
+    :return: MAX_JOBS when set, otherwise cpu count.
+    """
+    return _env_int(BUILD_JOBS_ENV) or os.cpu_count() or 1
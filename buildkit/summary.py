@@ -1,11 +1,26 @@
 import os
 import platform
 import shutil
+import sys
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Set, Tuple
 
+from .fsutil import link_or_copy
 from .options import BuildOptions
 
+TEMP_COPY_MODES = ("copy", "link")
+
+# Cython 缓存恢复、build_ext 等会原地覆写这些生成文件，链接模式下仍按复制处理
+_GENERATED_SUFFIXES = (".c", ".cpp", ".h", ".html", ".so", ".pyd")
+
+
+def _link_sources(src, dst) -> str:
+    src = os.fspath(src)
+    if src.endswith(_GENERATED_SUFFIXES):
+        return shutil.copy2(src, dst)
+    return link_or_copy(src, dst)
+
 
 def _build_gitignore_filter(base_dir: Path, options: Optional[BuildOptions]):
     if not options or not options.use_gitignore:
@@ -21,23 +36,29 @@ def _build_gitignore_filter(base_dir: Path, options: Optional[BuildOptions]):
         return None
     patterns = gitignore_path.read_text(encoding="utf-8").splitlines()
     spec = pathspec.PathSpec.from_lines("gitwildmatch", patterns)
+    base_str = os.path.abspath(base_dir)
+    base_prefix = os.path.join(base_str, "")
 
     def _ignore(dir_path, names):
-        ignored = []
-        dir_path = Path(dir_path)
-        for name in names:
-            src_path = dir_path / name
-            try:
-                rel = src_path.relative_to(base_dir).as_posix()
-            except ValueError:
-                continue
-            if spec.match_file(rel):
-                ignored.append(name)
-        return set(ignored)
+        # 每个目录只计算一次相对路径，逐个文件名仅做字符串拼接
+        abs_dir = os.path.abspath(dir_path)
+        if abs_dir == base_str:
+            prefix = ""
+        elif abs_dir.startswith(base_prefix):
+            prefix = abs_dir[len(base_prefix):].replace(os.sep, "/") + "/"
+        else:
+            return set()
+        return {name for name in names if spec.match_file(prefix + name)}
 
     return _ignore
 
 
+@lru_cache(maxsize=None)
+def _platform_info() -> Tuple[str, str]:
+    # platform.platform() 在部分系统上需调用外部命令，进程内只查询一次
+    return f"{platform.system()} / {platform.platform()}", platform.python_version()
+
+
 def print_summary(
     package_list: List[str],
     ext_list: Optional[List] = None,
@@ -53,22 +74,31 @@ def print_summary(
     :return: None.
     """
     flags = options.flags if options else None
-    print("")
-    print("========================================")
-    print("[SUMMARY] Build Summary")
-    print(" ├─ OS:", platform.system(), "/", platform.platform())
-    print(" ├─ Python:", platform.python_version())
-    print(f" ├─ Packages: {len(package_list)}")
-    print(f" ├─ Extensions: {len(ext_list or [])}")
-    print(f" ├─ Files excluded: {len(exclude_files or [])}")
+    os_name, python_version = _platform_info()
+    lines = [
+        "",
+        "========================================",
+        "[SUMMARY] Build Summary",
+        f" ├─ OS: {os_name}",
+        f" ├─ Python: {python_version}",
+        f" ├─ Packages: {len(package_list)}",
+        f" ├─ Extensions: {len(ext_list or [])}",
+        f" ├─ Files excluded: {len(exclude_files or [])}",
+    ]
     if options:
-        print(" ├─ Temp Build Dir:", "ENABLED" if options.use_temp_build else "DISABLED")
-        print(" ├─ Release Mode:", "ON" if flags and flags.is_release else "OFF")
-        print(" ├─ Dry Run:", "ON" if flags and flags.is_dry_run else "OFF")
-        print(" ├─ Old Mode:", "ON" if flags and flags.is_old else "OFF")
-    print(f" └─ DEBUG: {os.environ.get('DEBUG', '0')}")
-    print("========================================")
-    print("")
+        lines += [
+            f" ├─ Temp Build Dir: {'ENABLED' if options.use_temp_build else 'DISABLED'}",
+            f" ├─ Release Mode: {'ON' if flags and flags.is_release else 'OFF'}",
+            f" ├─ Dry Run: {'ON' if flags and flags.is_dry_run else 'OFF'}",
+            f" ├─ Old Mode: {'ON' if flags and flags.is_old else 'OFF'}",
+        ]
+    lines += [
+        f" └─ DEBUG: {os.environ.get('DEBUG', '0')}",
+        "========================================",
+        "",
+    ]
+    # 一次写出整段摘要，避免逐行 print 的加锁与刷新开销
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 def copy_to_temp_build_dir(
@@ -87,36 +117,54 @@ def copy_to_temp_build_dir(
     """
     if options and target is None:
         target = options.temp_build_dir
+    copy_mode = options.temp_copy_mode if options else "copy"
+    if copy_mode not in TEMP_COPY_MODES:
+        raise ValueError(f"Unknown temp copy mode {copy_mode!r}; expected one of {', '.join(TEMP_COPY_MODES)}.")
+    # 链接模式下暂存文件与源码共享 inode，对其原地修改会同步到源码目录
+    copy_function = _link_sources if copy_mode == "link" else shutil.copy2
     tmp_dir = Path(target or ".build_package_tmp")
     if tmp_dir.exists():
         shutil.rmtree(tmp_dir)
     tmp_dir.mkdir(parents=True)
 
-    ignore = _build_gitignore_filter(Path(base), options)
-    for pkg in package_list:
-        rel_path = pkg.replace(".", "/")
-        src_path = Path(base) / rel_path
+    base_path = Path(base)
+    ignore = _build_gitignore_filter(base_path, options)
+    copied: Set[str] = set()
+    # 父包先复制；子包已包含在父包目录树中时不再重复复制
+    for pkg in sorted(package_list, key=lambda name: name.count(".")):
+        parts = pkg.split(".")
+        if pkg in copied or any(".".join(parts[:depth]) in copied for depth in range(1, len(parts))):
+            continue
+        rel_path = "/".join(parts)
+        src_path = base_path / rel_path
         dst_path = tmp_dir / rel_path
         if src_path.exists():
             dst_path.parent.mkdir(parents=True, exist_ok=True)
-            if dst_path.exists():
-                shutil.rmtree(dst_path)
-            shutil.copytree(src_path, dst_path, ignore=ignore)
+            shutil.copytree(src_path, dst_path, ignore=ignore, copy_function=copy_function, dirs_exist_ok=True)
+            copied.add(pkg)
 
     print(f"[COPY] Copied source files to temporary dir: {tmp_dir}")
     return str(tmp_dir)
 
 
+@lru_cache(maxsize=32)
+def _package_dir_mapping(packages: Tuple[str, ...], tmp_dir: str) -> Dict[str, str]:
+    mapping: Dict[str, str] = {}
+    root = Path(tmp_dir)
+    for pkg in packages:
+        top_pkg = pkg.split(".")[0]
+        if top_pkg not in mapping:
+            mapping[top_pkg] = str(root / top_pkg)
+    return mapping
+
+
 def get_package_dir_mapping(packages: List[str], tmp_dir: str) -> Dict[str, str]:
     """为 setup(package_dir=...) 自动生成映射关系。
 
+    结果按 (packages, tmp_dir) 缓存，返回副本以免调用方修改缓存。
+
     :param packages: package list.
     :param tmp_dir: temp dir.
     :return: package dir mapping.
     """
-    mapping: Dict[str, str] = {}
-    for pkg in packages:
-        top_pkg = pkg.split(".")[0]
-        if top_pkg not in mapping:
-            mapping[top_pkg] = str(Path(tmp_dir) / top_pkg)
-    return mapping
+    return dict(_package_dir_mapping(tuple(packages), tmp_dir))
@@ -78,26 +78,27 @@ plan = BuildPlan(
     asset_copy_hook=copy_assets,
 )
 
-setup_kwargs, ext_modules = plan.build()
-setup_kwargs["cmdclass"] = plan.cmdclass(build_ext_cls=BuildExt)
-
-setup(
-    name="good_python",
-    version="0.1.0",
-    description="Short package description",
-    long_description=Path("README.md").read_text(encoding="utf-8"),
-    long_description_content_type="text/markdown",
-    author="Your Name",
-    author_email="you@example.com",
-    url="https://example.com/good_python",
-    license="MIT",
-    python_requires=">=3.9",
-    install_requires=[],
-    extras_require={},
-    ext_modules=ext_modules,
-    include_package_data=True,
-    **setup_kwargs,
-)
+if __name__ == "__main__":
+    setup_kwargs, ext_modules = plan.build()
+    setup_kwargs["cmdclass"] = plan.cmdclass(build_ext_cls=BuildExt)
+
+    setup(
+        name="good_python",
+        version="0.1.0",
+        description="Short package description",
+        long_description=Path("README.md").read_text(encoding="utf-8"),
+        long_description_content_type="text/markdown",
+        author="Your Name",
+        author_email="you@example.com",
+        url="https://example.com/good_python",
+        license="MIT",
+        python_requires=">=3.9",
+        install_requires=[],
+        extras_require={},
+        ext_modules=ext_modules,
+        include_package_data=True,
+        **setup_kwargs,
+    )
 """
 
 from pathlib import Path
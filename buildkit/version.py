@@ -1,6 +1,6 @@
 import re
 from pathlib import Path
-from typing import Optional, Pattern
+from typing import List, Optional, Pattern, Tuple
 
 
 _VERSION_PATTERNS: list[Pattern[str]] = [
@@ -14,6 +14,12 @@ _VERSION_PATTERNS: list[Pattern[str]] = [
     re.compile(r"(?im)^\s*ver\s*=\s*\(([^)]+)\)"),
 ]
 
+# 模块加载时确定每个模式是否为元组写法，避免解析时反复检查正则源码
+_TUPLE_SUFFIX = r"\(([^)]+)\)"
+_VERSION_RULES: List[Tuple[Pattern[str], bool]] = [
+    (pattern, pattern.pattern.endswith(_TUPLE_SUFFIX)) for pattern in _VERSION_PATTERNS
+]
+
 
 def _normalize_tuple_version(raw: str) -> Optional[str]:
     parts = [item.strip().strip("'\"") for item in raw.split(",")]
@@ -31,12 +37,12 @@ def read_version(path: Path) -> str:
     :raises ValueError: when no version info found.
     """
     content = path.read_text(encoding="utf-8")
-    for pattern in _VERSION_PATTERNS:
+    for pattern, is_tuple in _VERSION_RULES:
         match = pattern.search(content)
         if not match:
             continue
         value = match.group(1).strip()
-        if pattern.pattern.endswith(r"\(([^)]+)\)"):
+        if is_tuple:
             normalized = _normalize_tuple_version(value)
             if normalized:
                 return normalized
@@ -2,18 +2,13 @@ from buildkit.cython import discover_sources_from_packages
 from buildkit.runtime import set_dry_run
 
 
-def test_discover_sources_logs_excluded_in_dry_run(monkeypatch, capsys) -> None:
-    from pathlib import Path
+def test_discover_sources_logs_excluded_in_dry_run(tmp_path, monkeypatch, capsys) -> None:
+    pkg_dir = tmp_path / "demo"
+    pkg_dir.mkdir()
+    for name in ("pipeline.py", "core.py", "__init__.py"):
+        (pkg_dir / name).write_text("")
 
-    def fake_exists(self) -> bool:
-        return self.as_posix() == "demo"
-
-    def fake_rglob(self, pattern):
-        assert pattern == "*.py"
-        return [Path("demo/pipeline.py"), Path("demo/core.py"), Path("demo/__init__.py")]
-
-    monkeypatch.setattr(Path, "exists", fake_exists)
-    monkeypatch.setattr(Path, "rglob", fake_rglob)
+    monkeypatch.chdir(tmp_path)
     set_dry_run(True)
     try:
         sources = discover_sources_from_packages(
@@ -29,3 +24,31 @@ def test_discover_sources_logs_excluded_in_dry_run(monkeypatch, capsys) -> None:
     assert "[DRY-RUN] Would exclude source" in out
     assert all(src.name != "pipeline.py" for src in sources)
     assert any(src.name == "core.py" for src in sources)
+
+
+def test_discover_sources_dedups_overlapping_packages(tmp_path, monkeypatch) -> None:
+    (tmp_path / "demo" / "core").mkdir(parents=True)
+    (tmp_path / "demo" / "core" / "engine.py").write_text("")
+
+    monkeypatch.chdir(tmp_path)
+    sources = discover_sources_from_packages(
+        packages=["demo", "demo.core"],
+        package_dir={"demo": "demo"},
+    )
+
+    assert [src.as_posix() for src in sources] == ["demo/core/engine.py"]
+
+
+def test_discover_sources_normalizes_dot_prefixed_package_dir(tmp_path, monkeypatch) -> None:
+    (tmp_path / "demo" / "sub").mkdir(parents=True)
+    for rel in ("demo/pipeline.py", "demo/core.py", "demo/sub/job.py"):
+        (tmp_path / rel).write_text("")
+
+    monkeypatch.chdir(tmp_path)
+    sources = discover_sources_from_packages(
+        packages=["demo"],
+        package_dir={"demo": "./demo"},
+        exclude_globs=["demo/pipeline.py", "demo/sub/*"],
+    )
+
+    assert [src.as_posix() for src in sources] == ["demo/core.py"]
@@ -2,18 +2,12 @@ from buildkit.cython import discover_sources_from_packages
 from buildkit.runtime import set_dry_run
 
 
-def test_exclude_source_dirs_blocks_nested_folder(monkeypatch, capsys) -> None:
-    from pathlib import Path
+def test_exclude_source_dirs_blocks_nested_folder(tmp_path, monkeypatch, capsys) -> None:
+    (tmp_path / "demo" / "data").mkdir(parents=True)
+    (tmp_path / "demo" / "data" / "etl.py").write_text("")
+    (tmp_path / "demo" / "core.py").write_text("")
 
-    def fake_exists(self) -> bool:
-        return self.as_posix() == "demo"
-
-    def fake_rglob(self, pattern):
-        assert pattern == "*.py"
-        return [Path("demo/data/etl.py"), Path("demo/core.py")]
-
-    monkeypatch.setattr(Path, "exists", fake_exists)
-    monkeypatch.setattr(Path, "rglob", fake_rglob)
+    monkeypatch.chdir(tmp_path)
     set_dry_run(True)
     try:
         sources = discover_sources_from_packages(
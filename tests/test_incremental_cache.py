@@ -0,0 +1,65 @@
+import os
+import threading
+
+from buildkit.cython import filter_changed_sources, has_changed_sources
+
+
+def test_filter_changed_sources_uses_content_not_mtime(tmp_path) -> None:
+    cache_file = tmp_path / ".cycache"
+    core = tmp_path / "core.py"
+    util = tmp_path / "util.py"
+    core.write_text("x = 1\n")
+    util.write_text("y = 2\n")
+
+    assert filter_changed_sources([core, util], cache_file) == [core, util]
+    assert filter_changed_sources([core, util], cache_file) == []
+
+    stat = core.stat()
+    os.utime(core, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10_000_000_000))
+    assert filter_changed_sources([core, util], cache_file) == []
+
+    util.write_text("y = 30\n")
+    assert filter_changed_sources([core, util], cache_file) == [util]
+
+
+def test_filter_changed_sources_skips_hashing_unchanged_files(tmp_path) -> None:
+    cache_file = tmp_path / ".cycache"
+    core = tmp_path / "core.py"
+    core.write_text("x = 1\n")
+    hashed = []
+
+    def fingerprint(path):
+        hashed.append(path)
+        return path.read_bytes()
+
+    assert filter_changed_sources([core], cache_file, fingerprint_fn=fingerprint) == [core]
+    assert filter_changed_sources([core], cache_file, fingerprint_fn=fingerprint) == []
+    assert hashed == [core]
+
+
+def test_has_changed_sources_does_not_update_cache(tmp_path) -> None:
+    cache_file = tmp_path / ".cycache"
+    core = tmp_path / "core.py"
+    core.write_text("x = 1\n")
+
+    assert has_changed_sources([core], cache_file) is True
+    assert not cache_file.exists()
+    filter_changed_sources([core], cache_file)
+    assert has_changed_sources([core], cache_file) is False
+
+
+def test_filter_changed_sources_runs_custom_fingerprint_serially(tmp_path) -> None:
+    cache_file = tmp_path / ".cycache"
+    sources = []
+    for index in range(8):
+        src = tmp_path / f"mod{index}.py"
+        src.write_text(f"x = {index}\n")
+        sources.append(src)
+    threads = set()
+
+    def fingerprint(path):
+        threads.add(threading.get_ident())
+        return path.read_bytes()
+
+    assert filter_changed_sources(sources, cache_file, fingerprint_fn=fingerprint) == sources
+    assert threads == {threading.get_ident()}
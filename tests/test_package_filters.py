@@ -9,3 +9,12 @@ def test_exclude_package_boundary_match() -> None:
     assert "pytrade.data" in excluded
     assert "pytrade.data.jobs" in excluded
     assert "pytrade.database" in included
+
+
+def test_exclude_package_glob_and_name_mix() -> None:
+    included, excluded = split_packages(
+        ["app", "app.tests", "app.core", "app.core.tests", "tools.cli"],
+        ["*.tests", "tools"],
+    )
+    assert included == ["app", "app.core"]
+    assert excluded == ["app.tests", "app.core.tests", "tools.cli"]
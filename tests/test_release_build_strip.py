@@ -0,0 +1,72 @@
+import os
+
+from setuptools import Distribution
+
+from buildkit.commands import ReleaseBuild
+from buildkit.flags import BuildFlags
+from buildkit.options import BuildOptions
+from buildkit.runtime import set_dry_run
+
+
+def _touch(path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text("")
+
+
+def _run_release(base_dir, build_lib, skip_dirs=frozenset(), dry_run=False) -> int:
+    options = BuildOptions(
+        flags=BuildFlags(is_release=True),
+        base_dir=base_dir,
+        summary_enabled=False,
+        skip_dirs=set(skip_dirs),
+    )
+    counts = []
+
+    class Build(ReleaseBuild):
+        def post_release_cleanup(self, removed, options):
+            counts.append(removed)
+
+    Build.options = options
+    dist = Distribution({"name": "demo"})
+    dist.script_name = "setup.py"
+    cmd = Build(dist)
+    cmd.ensure_finalized()
+    cmd.build_lib = str(build_lib)
+    set_dry_run(dry_run)
+    try:
+        cmd.run()
+    finally:
+        set_dry_run(False)
+    return counts[0]
+
+
+def test_release_strips_build_lib_under_base_dir_once(tmp_path, monkeypatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    _touch(tmp_path / "pkg" / "core.py")
+    _touch(tmp_path / "build" / "lib" / "pkg" / "core.py")
+
+    assert _run_release(tmp_path, tmp_path / "build" / "lib", dry_run=True) == 2
+    assert _run_release(tmp_path, tmp_path / "build" / "lib") == 2
+    assert not (tmp_path / "pkg" / "core.py").exists()
+    assert not (tmp_path / "build" / "lib" / "pkg" / "core.py").exists()
+
+
+def test_release_strips_build_lib_outside_base_dir(tmp_path, monkeypatch) -> None:
+    base_dir = tmp_path / "project"
+    build_lib = tmp_path / "out" / "lib"
+    monkeypatch.chdir(tmp_path)
+    _touch(base_dir / "pkg" / "core.py")
+    _touch(build_lib / "pkg" / "core.py")
+
+    assert _run_release(base_dir, build_lib) == 2
+    assert not (build_lib / "pkg" / "core.py").exists()
+
+
+def test_release_leaves_build_lib_hidden_by_skip_dirs(tmp_path, monkeypatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    _touch(tmp_path / "pkg" / "core.py")
+    _touch(tmp_path / "build" / "lib" / "pkg" / "core.py")
+
+    assert _run_release(tmp_path, tmp_path / "build" / "lib", skip_dirs={"build"}) == 1
+    assert not (tmp_path / "pkg" / "core.py").exists()
+    assert os.path.exists(tmp_path / "build" / "lib" / "pkg" / "core.py")
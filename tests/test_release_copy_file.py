@@ -0,0 +1,25 @@
+import os
+
+from setuptools import Distribution
+
+from buildkit.commands import ReleaseBuild
+
+
+def test_release_build_copy_file_hardlinks_inplace_output(tmp_path, monkeypatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    built = tmp_path / "build" / "demo.so"
+    built.parent.mkdir()
+    built.write_bytes(b"\x7fELF-binary")
+    target = tmp_path / "demo.so"
+    dist = Distribution({"name": "demo"})
+    dist.script_name = "setup.py"
+    cmd = ReleaseBuild(dist)
+    cmd.ensure_finalized()
+
+    assert cmd.copy_file(str(built), str(target)) == (str(target), 1)
+    assert os.path.samefile(built, target)
+
+    # 目标已是同一 inode 时不能被截断
+    assert cmd.copy_file(str(built), str(target)) == (str(target), 1)
+    assert os.path.samefile(built, target)
+    assert target.read_bytes() == b"\x7fELF-binary"
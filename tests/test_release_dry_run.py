@@ -2,25 +2,13 @@ from buildkit.release import strip_sources
 from buildkit.runtime import set_dry_run
 
 
-def test_strip_sources_dry_run_keeps_files(capsys) -> None:
-    class FakePath:
-        def __init__(self, value: str):
-            self._value = value
-            self.parts = tuple(value.split("/"))
-            self.name = value.split("/")[-1]
-
-        def __str__(self):
-            return self._value
-
-    class FakeBaseDir:
-        def rglob(self, pattern):
-            assert pattern == "*.py"
-            return [FakePath("demo.py")]
+def test_strip_sources_dry_run_keeps_files(tmp_path, capsys) -> None:
+    (tmp_path / "demo.py").write_text("x = 1\n")
 
     set_dry_run(True)
     try:
         removed = strip_sources(
-            base_dir=FakeBaseDir(),
+            base_dir=tmp_path,
             patterns=["*.py"],
             keep_files=set(),
             skip_dirs=set(),
@@ -30,3 +18,22 @@ def test_strip_sources_dry_run_keeps_files(capsys) -> None:
     out = capsys.readouterr().out
     assert removed == 1
     assert "[DRY-RUN] Would remove" in out
+    assert (tmp_path / "demo.py").exists()
+
+
+def test_strip_sources_single_walk_respects_skip_and_keep(tmp_path) -> None:
+    for rel in ("pkg/__init__.py", "pkg/core.py", "pkg/core.c", "pkg/core.so", "pkg/data.txt", "venv/lib.py"):
+        path = tmp_path / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("")
+
+    removed = strip_sources(
+        base_dir=tmp_path,
+        patterns=["*.py", "*.c", "core.s?"],
+        keep_files={"__init__.py"},
+        skip_dirs={"venv"},
+    )
+
+    remaining = sorted(path.relative_to(tmp_path).as_posix() for path in tmp_path.rglob("*") if path.is_file())
+    assert removed == 3
+    assert remaining == ["pkg/__init__.py", "pkg/data.txt", "venv/lib.py"]
@@ -0,0 +1,180 @@
+from Cython.Compiler.Errors import CompileError
+from setuptools import Extension
+
+import buildkit.cython as cython_mod
+from buildkit.cython import safe_cythonize
+
+
+def test_safe_cythonize_batches_and_isolates_failures(monkeypatch, capsys) -> None:
+    calls = []
+
+    def fake_cythonize(extensions, **options):
+        names = [ext.name for ext in extensions]
+        calls.append(names)
+        if "pkg.bad" in names:
+            raise CompileError(None, "boom")
+        return extensions
+
+    monkeypatch.setattr(cython_mod, "_ensure_cythonize", lambda: fake_cythonize)
+    extensions = [Extension(f"pkg.{name}", [f"pkg/{name}.py"]) for name in ("a", "b", "bad", "c")]
+
+    compiled = safe_cythonize(extensions, {"language_level": "3"}, nthreads=2)
+
+    assert [ext.name for ext in compiled] == ["pkg.a", "pkg.b", "pkg.c"]
+    assert calls[0] == ["pkg.a", "pkg.b", "pkg.bad", "pkg.c"]
+    assert "pkg.bad" in capsys.readouterr().out
+
+
+def test_safe_cythonize_reuses_stamped_c_files(tmp_path, monkeypatch) -> None:
+    cythonized = []
+
+    def fake_cythonize(extensions, **options):
+        result = []
+        for ext in extensions:
+            cythonized.append(ext.name)
+            c_path = ext.sources[0][: -len(".py")] + ".c"
+            with open(c_path, "w") as fh:
+                fh.write("/* Generated by Cython */\n")
+            result.append(Extension(ext.name, [c_path]))
+        return result
+
+    monkeypatch.setattr(cython_mod, "_ensure_cythonize", lambda: fake_cythonize)
+    core = tmp_path / "core.py"
+    util = tmp_path / "util.py"
+    core.write_text("x = 1\n")
+    util.write_text("y = 2\n")
+
+    def run(directives):
+        extensions = [Extension(path.stem, [str(path)]) for path in (core, util)]
+        return safe_cythonize(extensions, directives, nthreads=1, reuse_c=True)
+
+    run({"language_level": "3"})
+    assert cythonized == ["core", "util"]
+
+    compiled = run({"language_level": "3"})
+    assert cythonized == ["core", "util"]
+    assert [ext.sources for ext in compiled] == [[str(tmp_path / "core.c")], [str(tmp_path / "util.c")]]
+
+    util.write_text("y = 20\n")
+    run({"language_level": "3"})
+    assert cythonized == ["core", "util", "util"]
+
+    run({"language_level": "3", "binding": False})
+    assert cythonized == ["core", "util", "util", "core", "util"]
+
+
+def test_safe_cythonize_defaults_to_serial(monkeypatch) -> None:
+    seen = []
+
+    def fake_cythonize(extensions, **options):
+        seen.append(options["nthreads"])
+        return extensions
+
+    monkeypatch.setattr(cython_mod, "_ensure_cythonize", lambda: fake_cythonize)
+    monkeypatch.delenv("CYTHONIZE_JOBS", raising=False)
+    extensions = [Extension("pkg.a", ["pkg/a.py"])]
+
+    safe_cythonize(extensions, {})
+    safe_cythonize(extensions, {}, nthreads=1)
+    safe_cythonize(extensions, {}, nthreads=4)
+    monkeypatch.setenv("CYTHONIZE_JOBS", "3")
+    safe_cythonize(extensions, {})
+    safe_cythonize(extensions, {}, nthreads=0)
+
+    assert seen == [0, 0, 4, 3, 0]
+
+
+def test_safe_cythonize_reuse_keeps_distutils_headers_and_tracks_cimports(tmp_path, monkeypatch) -> None:
+    cythonized = []
+
+    def fake_cythonize(extensions, **options):
+        result = []
+        for ext in extensions:
+            cythonized.append(ext.name)
+            with open("mod.c", "w") as fh:
+                fh.write("/* Generated by Cython */\n")
+            result.append(Extension(ext.name, ["mod.c"], libraries=["m"], define_macros=[("FOO", "1")]))
+        return result
+
+    monkeypatch.setattr(cython_mod, "_ensure_cythonize", lambda: fake_cythonize)
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "dep.pxd").write_text("cdef int f(int x)\n")
+    (tmp_path / "mod.py").write_text(
+        "# distutils: libraries = m\n"
+        "# distutils: define_macros = FOO=1\n"
+        "from cython.cimports.dep import f\n"
+    )
+
+    def run():
+        return safe_cythonize([Extension("mod", ["mod.py"])], {}, nthreads=0, reuse_c=True)
+
+    run()
+    reused = run()
+    assert cythonized == ["mod"]
+    assert reused[0].sources == ["mod.c"]
+    assert reused[0].libraries == ["m"]
+    assert reused[0].define_macros == [("FOO", "1")]
+
+    (tmp_path / "dep.pxd").write_text("cdef int f(int x, int y)\n")
+    run()
+    assert cythonized == ["mod", "mod"]
+
+
+def test_safe_cythonize_reuse_passes_c_sources_through(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(cython_mod, "_ensure_cythonize", lambda: lambda extensions, **options: extensions)
+    hand = tmp_path / "hand.c"
+    hand.write_text("int hand(void) { return 1; }\n")
+
+    for _ in range(3):
+        compiled = safe_cythonize([Extension("hand", [str(hand)])], {}, nthreads=0, reuse_c=True)
+        assert compiled[0].sources == [str(hand)]
+
+    assert hand.read_text() == "int hand(void) { return 1; }\n"
+
+
+def test_safe_cythonize_reuse_stamp_tracks_module_name(tmp_path, monkeypatch) -> None:
+    cythonized = []
+
+    def fake_cythonize(extensions, **options):
+        for ext in extensions:
+            cythonized.append(ext.name)
+            with open(str(tmp_path / "mod.c"), "w") as fh:
+                fh.write("/* Generated by Cython */\n")
+        return [Extension(ext.name, [str(tmp_path / "mod.c")]) for ext in extensions]
+
+    monkeypatch.setattr(cython_mod, "_ensure_cythonize", lambda: fake_cythonize)
+    src = tmp_path / "mod.py"
+    src.write_text("x = 1\n")
+
+    safe_cythonize([Extension("a.mod", [str(src)])], {}, nthreads=0, reuse_c=True)
+    safe_cythonize([Extension("b.mod", [str(src)])], {}, nthreads=0, reuse_c=True)
+
+    assert cythonized == ["a.mod", "b.mod"]
+
+
+def test_safe_cythonize_reuse_retries_do_not_regenerate_good_modules(tmp_path, monkeypatch) -> None:
+    generated = []
+
+    def fake_cythonize(extensions, **options):
+        # 模拟 Cython：未 force 时已存在的 .c 视为最新，串行处理遇错即抛出
+        result = []
+        for ext in extensions:
+            c_path = ext.sources[0][: -len(".py")] + ".c"
+            if options["force"] or not (tmp_path / c_path).exists():
+                if ext.name == "bad":
+                    raise CompileError(None, "boom")
+                generated.append(ext.name)
+                (tmp_path / c_path).write_text("/* Generated by Cython */\n")
+            result.append(Extension(ext.name, [c_path]))
+        return result
+
+    monkeypatch.setattr(cython_mod, "_ensure_cythonize", lambda: fake_cythonize)
+    monkeypatch.chdir(tmp_path)
+    names = ["a", "b", "c", "bad", "d", "e", "f", "g"]
+    for name in names:
+        (tmp_path / f"{name}.py").write_text(f"{name} = 1\n")
+
+    compiled = safe_cythonize([Extension(name, [f"{name}.py"]) for name in names], {}, nthreads=0, reuse_c=True)
+
+    assert [ext.name for ext in compiled] == [name for name in names if name != "bad"]
+    assert sorted(generated) == ["a", "b", "c", "d", "e", "f", "g"]
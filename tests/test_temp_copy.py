@@ -0,0 +1,34 @@
+import os
+
+from buildkit.flags import BuildFlags
+from buildkit.options import BuildOptions
+from buildkit.summary import copy_to_temp_build_dir
+
+
+def test_copy_to_temp_build_dir_link_mode(tmp_path) -> None:
+    src = tmp_path / "pkg" / "core.py"
+    src.parent.mkdir()
+    src.write_text("x = 1\n")
+    options = BuildOptions(flags=BuildFlags(), base_dir=tmp_path, temp_copy_mode="link")
+
+    tmp_dir = copy_to_temp_build_dir(["pkg"], base=str(tmp_path), target=str(tmp_path / "tmp"), options=options)
+
+    staged = os.path.join(tmp_dir, "pkg", "core.py")
+    assert os.path.samefile(staged, src)
+    os.unlink(staged)
+    assert src.read_text() == "x = 1\n"
+
+
+def test_copy_to_temp_build_dir_link_mode_copies_generated_files(tmp_path) -> None:
+    c_file = tmp_path / "pkg" / "core.c"
+    c_file.parent.mkdir()
+    c_file.write_text("/* old */\n")
+    options = BuildOptions(flags=BuildFlags(), base_dir=tmp_path, temp_copy_mode="link")
+
+    tmp_dir = copy_to_temp_build_dir(["pkg"], base=str(tmp_path), target=str(tmp_path / "tmp"), options=options)
+
+    staged = os.path.join(tmp_dir, "pkg", "core.c")
+    assert not os.path.samefile(staged, c_file)
+    with open(staged, "w") as fh:
+        fh.write("/* new */\n")
+    assert c_file.read_text() == "/* old */\n"